@@ -5,11 +5,12 @@ Output follows the EXACT schema required by the problem statement.
 
 from __future__ import annotations
 
+import re
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
 
 
 # ── Enums ──────────────────────────────────────────────────────────────
@@ -23,13 +24,28 @@ class RiskLevel(str, Enum):
 
 # ── VCF / Variant Models ──────────────────────────────────────────────
 
+_BASE_ALLELE_RE = re.compile(r"[ACGTNacgtn*.]+")
+
+
+def _canonical_allele(allele: str) -> str:
+    """Uppercase alleles made only of bases; leave symbolic/breakend ALTs as-is."""
+    return allele.upper() if _BASE_ALLELE_RE.fullmatch(allele) else allele
+
+
+# VCF bases are case-insensitive; base alleles are stored uppercase so the
+# engine can compare them with plain ==. Symbolic (<INS:ME:Alu>) and
+# breakend (G]chr17:198982]) alleles keep their case: IDs and contig
+# names inside them are case-sensitive.
+Allele = Annotated[str, AfterValidator(_canonical_allele)]
+
+
 class Variant(BaseModel):
     """A single parsed VCF variant."""
     chrom: str
     pos: int
     rsid: Optional[str] = None
-    ref: str
-    alt: str
+    ref: Allele
+    alt: Allele
     quality: Optional[float] = None
     filter_status: str = "."
     info: dict = Field(default_factory=dict)
@@ -6,10 +6,14 @@ database to produce per-drug risk assessments in the required output schema.
 
 from __future__ import annotations
 
-import json
+import re
+import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+
+import orjson
 
 from .models import (
     AnalysisResult,
@@ -23,29 +27,46 @@ from .models import (
     RiskLevel,
     Variant,
 )
+from .vcf_parser import VariantRecord
+
+# Anything the engine can analyze: API input models or parser records
+VariantLike = Union[Variant, VariantRecord]
 
 # ── Load drug-gene database at module level ────────────────────────────
 
 _DB_PATH = Path(__file__).parent / "data" / "drug_gene_db.json"
 _drug_gene_db: dict = {}
 
+# Every rsID referenced by an interaction, built alongside the DB
+_pgx_rsid_set: frozenset[str] = frozenset()
+
 
 def _load_db() -> dict:
-    """Load the drug-gene database JSON file."""
-    global _drug_gene_db
+    """Load the drug-gene database JSON file and build the rsID set."""
+    global _drug_gene_db, _pgx_rsid_set
     if not _drug_gene_db:
-        with open(_DB_PATH, "r") as f:
-            _drug_gene_db = json.load(f)
+        db = orjson.loads(_DB_PATH.read_bytes())
+
+        pgx_rsids: set[str] = set()
+        for drug_info in db["drugs"].values():
+            for interaction in drug_info["interactions"]:
+                interaction["rsid"] = sys.intern(interaction["rsid"])
+                interaction["risk_allele_upper"] = interaction["risk_allele"].upper()
+                pgx_rsids.add(interaction["rsid"])
+
+        _pgx_rsid_set = frozenset(pgx_rsids)
+        _drug_gene_db = db
     return _drug_gene_db
 
 
-def get_supported_drugs() -> list[dict]:
-    """Return a list of all supported drugs with metadata."""
+@lru_cache(maxsize=1)
+def get_supported_drugs() -> tuple[dict, ...]:
+    """Return all supported drugs with metadata (built once; the DB is static)."""
     db = _load_db()
-    return [
+    return tuple(
         {"id": drug_id, "name": info["name"], "category": info["category"]}
         for drug_id, info in db["drugs"].items()
-    ]
+    )
 
 
 # ── Risk level ordering for worst-case selection ───────────────────────
@@ -80,8 +101,16 @@ _CONFIDENCE_MAP = {
     RiskLevel.CRITICAL: 0.90,
 }
 
+# ── Precompiled patterns for phenotype / recommendation text ─────────
+
+_DIPLO_RE = re.compile(r'\(\*\d+/\*\d+\w?\)')
+_DOSE_RE = re.compile(r'(\d+[-–]\d+%\s*(?:dose reduction|lower|higher))', re.IGNORECASE)
+_REDUCE_RE = re.compile(r'[Rr]educe dose\s+by\s+[\d\-–%\s]+')
+
 # ── Phenotype abbreviation map ────────────────────────────────────────
 
+# Phenotype strings come from the closed set in the DB, so results are cached
+@lru_cache(maxsize=256)
 def _abbreviate_phenotype(phenotype: str) -> str:
     """Map full phenotype names to standard abbreviations."""
     p = phenotype.lower()
@@ -106,17 +135,26 @@ def _abbreviate_phenotype(phenotype: str) -> str:
     return "Unknown"
 
 
+def build_variant_map(variants: list[VariantLike]) -> dict[str, VariantLike]:
+    """Index variants by rsID (later records win for repeated rsIDs)."""
+    return {v.rsid: v for v in variants if v.rsid}
+
+
 def analyze_variants(
-    variants: list[Variant], drug_names: list[str]
+    variants: list[VariantLike],
+    drug_names: list[str],
+    variant_map: Optional[dict[str, VariantLike]] = None,
 ) -> list[AnalysisResult]:
-    """Analyze patient variants against requested drugs (internal format)."""
+    """Analyze patient variants against requested drugs (internal format).
+
+    ``variant_map`` may be passed in (see ``build_variant_map``) to avoid
+    re-indexing ``variants`` when the caller already has it.
+    """
     db = _load_db()
     results: list[AnalysisResult] = []
 
-    variant_map: dict[str, Variant] = {}
-    for v in variants:
-        if v.rsid:
-            variant_map[v.rsid] = v
+    if variant_map is None:
+        variant_map = build_variant_map(variants)
 
     for drug_name in drug_names:
         drug_key = drug_name.lower().strip()
@@ -139,7 +177,7 @@ def analyze_variants(
         for interaction in drug_info["interactions"]:
             rsid = interaction["rsid"]
             gene = interaction["gene"]
-            risk_allele = interaction["risk_allele"]
+            risk_allele = interaction["risk_allele_upper"]
             phenotypes = interaction["phenotypes"]
             evidence = interaction.get("evidence", [])
 
@@ -155,7 +193,11 @@ def analyze_variants(
             pheno_data = phenotypes.get(genotype_key, phenotypes.get("0/0", {}))
             risk_level = RiskLevel(pheno_data.get("level", "NORMAL"))
 
-            result = DrugRiskResult(
+            # Only a strictly worse interaction replaces the current result
+            if worst_result is not None and _RISK_ORDER[risk_level] <= _RISK_ORDER[worst_result.risk_level]:
+                continue
+
+            worst_result = DrugRiskResult(
                 drug_name=drug_info["name"],
                 gene=gene,
                 variant=f"{patient_variant.ref}>{patient_variant.alt}" if patient_variant else None,
@@ -167,8 +209,9 @@ def analyze_variants(
                 evidence_sources=evidence,
             )
 
-            if worst_result is None or _RISK_ORDER[result.risk_level] > _RISK_ORDER[worst_result.risk_level]:
-                worst_result = result
+            # Nothing ranks above CRITICAL
+            if risk_level == RiskLevel.CRITICAL:
+                break
 
         results.append(AnalysisResult(drug_risk=worst_result or DrugRiskResult(drug_name=drug_info["name"], gene="N/A")))
 
@@ -177,24 +220,28 @@ def analyze_variants(
 
 def convert_to_required_schema(
     results: list[AnalysisResult],
-    variants: list[Variant],
+    variants: list[VariantLike],
     sample_id: str = "PATIENT_001",
+    variant_map: Optional[dict[str, VariantLike]] = None,
+    timestamp: Optional[str] = None,
 ) -> list[PharmaGuardResult]:
-    """Convert internal AnalysisResult list to the required output schema."""
+    """Convert internal AnalysisResult list to the required output schema.
+
+    ``timestamp`` defaults to the current UTC time in ISO format.
+    """
     db = _load_db()
-    variant_map: dict[str, Variant] = {}
-    for v in variants:
-        if v.rsid:
-            variant_map[v.rsid] = v
+    if variant_map is None:
+        variant_map = build_variant_map(variants)
 
-    timestamp = datetime.now(timezone.utc).isoformat()
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc).isoformat()
     output: list[PharmaGuardResult] = []
     total_variants = len(variants)
-    pgx_variants_found = sum(1 for v in variants if v.rsid and _is_pharmacogenomic_rsid(v.rsid))
+    pgx_variants_found = len(_pgx_rsid_set.intersection(variant_map))
 
     for result in results:
         dr = result.drug_risk
-        drug_key = dr.drug_name.lower().replace(" ", "").replace("(5-fu)", "")
+        drug_key = _normalize_drug_key(dr.drug_name)
         drug_info = db["drugs"].get(drug_key, {})
 
         # Collect all detected variants for this drug
@@ -215,6 +262,7 @@ def convert_to_required_schema(
 
         # Build diplotype string from phenotype
         diplotype = _extract_diplotype(dr.phenotype)
+        dosage_adjustment, alternatives, monitoring = _extract_clinical_details(dr.recommendation)
 
         pharma_result = PharmaGuardResult(
             patient_id=sample_id,
@@ -233,9 +281,9 @@ def convert_to_required_schema(
             ),
             clinical_recommendation=ClinicalRecommendation(
                 action=dr.recommendation,
-                dosage_adjustment=_extract_dosage_adjustment(dr.recommendation),
-                alternative_drugs=_extract_alternatives(dr.recommendation),
-                monitoring=_extract_monitoring(dr.recommendation),
+                dosage_adjustment=dosage_adjustment,
+                alternative_drugs=list(alternatives),
+                monitoring=monitoring,
                 evidence_sources=dr.evidence_sources,
             ),
             llm_generated_explanation=result.llm_explanation,
@@ -252,20 +300,15 @@ def convert_to_required_schema(
     return output
 
 
-def _is_pharmacogenomic_rsid(rsid: str) -> bool:
-    """Check if an rsID is in our drug-gene database."""
-    db = _load_db()
-    for drug_info in db["drugs"].values():
-        for interaction in drug_info["interactions"]:
-            if interaction["rsid"] == rsid:
-                return True
-    return False
+@lru_cache(maxsize=256)
+def _normalize_drug_key(drug_name: str) -> str:
+    """Map a display drug name (e.g. "Fluorouracil (5-FU)") back to its DB key."""
+    return drug_name.lower().replace(" ", "").replace("(5-fu)", "")
 
 
 def _extract_diplotype(phenotype: str) -> str:
     """Extract diplotype string from phenotype description."""
-    import re
-    match = re.search(r'\(\*\d+/\*\d+\w?\)', phenotype)
+    match = _DIPLO_RE.search(phenotype)
     if match:
         return match.group(0).strip("()")
     p = phenotype.lower()
@@ -276,34 +319,47 @@ def _extract_diplotype(phenotype: str) -> str:
     return "*1/*1"
 
 
-def _extract_dosage_adjustment(recommendation: str) -> Optional[str]:
+_ALTERNATIVE_DRUGS = ("prasugrel", "ticagrelor", "pravastatin", "rosuvastatin")
+_ALTERNATIVE_DRUGS_RE = re.compile("|".join(_ALTERNATIVE_DRUGS))
+
+
+# Recommendations come from the closed set in the DB, so results are cached
+@lru_cache(maxsize=256)
+def _extract_clinical_details(
+    recommendation: str,
+) -> tuple[Optional[str], tuple[str, ...], Optional[str]]:
+    """Extract (dosage adjustment, alternatives, monitoring) from one recommendation."""
+    rec_lower = recommendation.lower()
+    return (
+        _extract_dosage_adjustment(recommendation, rec_lower),
+        _extract_alternatives(rec_lower),
+        _extract_monitoring(rec_lower),
+    )
+
+
+def _extract_dosage_adjustment(recommendation: str, rec_lower: str) -> Optional[str]:
     """Extract dosage adjustment info from recommendation text."""
-    import re
-    match = re.search(r'(\d+[-–]\d+%\s*(?:dose reduction|lower|higher))', recommendation, re.IGNORECASE)
+    match = _DOSE_RE.search(recommendation)
     if match:
         return match.group(0)
-    if "reduce dose" in recommendation.lower():
-        match2 = re.search(r'[Rr]educe dose\s+by\s+[\d\-–%\s]+', recommendation)
+    if "reduce dose" in rec_lower:
+        match2 = _REDUCE_RE.search(recommendation)
         if match2:
             return match2.group(0)
     return None
 
 
-def _extract_alternatives(recommendation: str) -> list[str]:
-    """Extract alternative drug suggestions."""
-    alternatives = []
-    keywords = ["prasugrel", "ticagrelor", "pravastatin", "rosuvastatin"]
-    for drug in keywords:
-        if drug.lower() in recommendation.lower():
-            alternatives.append(drug.capitalize())
-    if "alternative" in recommendation.lower() and not alternatives:
-        alternatives.append("Consult prescriber for alternatives")
+def _extract_alternatives(rec_lower: str) -> tuple[str, ...]:
+    """Extract alternative drug suggestions from lowercased recommendation text."""
+    found = {m.group(0) for m in _ALTERNATIVE_DRUGS_RE.finditer(rec_lower)}
+    alternatives = tuple(drug.capitalize() for drug in _ALTERNATIVE_DRUGS if drug in found)
+    if not alternatives and "alternative" in rec_lower:
+        return ("Consult prescriber for alternatives",)
     return alternatives
 
 
-def _extract_monitoring(recommendation: str) -> Optional[str]:
-    """Extract monitoring instructions."""
-    rec_lower = recommendation.lower()
+def _extract_monitoring(rec_lower: str) -> Optional[str]:
+    """Extract monitoring instructions from lowercased recommendation text."""
     if "monitor" in rec_lower:
         if "inr" in rec_lower:
             return "Monitor INR closely"
@@ -315,29 +371,47 @@ def _extract_monitoring(recommendation: str) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=64)
+def _parse_gt_indices(gt: str) -> tuple[int, ...]:
+    """Parse a GT string ("0/1", "1|1", "./.") into its called allele indices."""
+    indices = []
+    for idx_str in gt.replace("|", "/").split("/"):
+        if idx_str == ".":
+            continue
+        try:
+            indices.append(int(idx_str))
+        except ValueError:
+            continue
+    return tuple(indices)
+
+
+@lru_cache(maxsize=1024)
+def _allele_tuple(ref: str, alt: str) -> tuple[str, ...]:
+    """Return (REF, ALT1, ALT2, ...), indexable by GT allele index."""
+    return (ref, *alt.split(","))
+
+
 def _classify_genotype(
-    variant: Variant, risk_allele: str, normal_allele: str
+    variant: VariantLike, risk_allele: str, normal_allele: str
 ) -> str:
-    """Classify a patient's genotype into 0/0, 0/1, or 1/1 relative to the risk allele."""
+    """Classify a patient's genotype into 0/0, 0/1, or 1/1 relative to the risk allele.
+
+    Alleles on both sides are already uppercase: variants are canonicalized
+    on parse/validation and the DB stores ``risk_allele_upper``.
+    """
     gt = variant.genotype
     if not gt:
-        if variant.alt.upper() == risk_allele.upper():
+        if variant.alt == risk_allele:
             return "0/1"
         return "0/0"
 
-    alleles_idx = gt.replace("|", "/").split("/")
-    allele_list = [variant.ref] + variant.alt.split(",")
+    allele_list = _allele_tuple(variant.ref, variant.alt)
+    n_alleles = len(allele_list)
 
     risk_count = 0
-    for idx_str in alleles_idx:
-        if idx_str == ".":
-            continue
-        try:
-            idx = int(idx_str)
-            if idx < len(allele_list) and allele_list[idx].upper() == risk_allele.upper():
-                risk_count += 1
-        except ValueError:
-            continue
+    for idx in _parse_gt_indices(gt):
+        if idx < n_alleles and allele_list[idx] == risk_allele:
+            risk_count += 1
 
     if risk_count == 0:
         return "0/0"
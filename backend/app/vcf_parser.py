@@ -8,153 +8,624 @@ and sample genotype information.
 from __future__ import annotations
 
 import io
+import mmap
+import os
 import re
-from typing import BinaryIO
+import sys
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterator, Optional, Union
 
 from .models import Variant
 
+_Buffer = Union[bytes, mmap.mmap]
 
-def parse_vcf(file_content: str | bytes | BinaryIO) -> dict:
+
+class InfoView(Mapping):
+    """Read-only mapping over a raw INFO column, parsed on demand.
+
+    ``get``/``[]`` scan the ``;``-separated tokens for just the requested
+    key and cache the result; iterating, ``len`` or ``to_dict`` parse the
+    whole column once. Values are ``str``, or ``True`` for flag keys.
+    """
+    __slots__ = ("_raw", "_parsed", "_complete")
+
+    def __init__(self, raw: bytes) -> None:
+        self._raw = raw
+        self._parsed: dict = {}
+        self._complete = False
+
+    def get(self, key: str, default=None):
+        parsed = self._parsed
+        if key in parsed:
+            return parsed[key]
+        if self._complete or self._raw == b"." or not isinstance(key, str):
+            return default
+
+        needle = key.encode("utf-8")
+        prefix = needle + b"="
+        # Scan from the end so a repeated key resolves like the full parse
+        for token in reversed(self._raw.split(b";")):
+            if token == needle:
+                value = True
+            elif token.startswith(prefix):
+                value = token[len(prefix):].decode("utf-8", errors="replace")
+            else:
+                continue
+            parsed[key] = value
+            return value
+        return default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"InfoView({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Return the fully parsed INFO dict (cached; do not mutate)."""
+        if not self._complete:
+            self._parsed = _parse_info(self._raw)
+            self._complete = True
+        return self._parsed
+
+
+_MISSING = object()
+
+# Distinct QUAL strings remembered per parse; beyond that float() runs as usual
+_QUAL_POOL_SIZE = 1024
+
+# Bytes per newline-aligned block handed to bytes.split by _iter_blocks
+_BLOCK_SIZE = 1 << 14
+
+_BASE_CHARS = b"ACGTNacgtn*."
+
+# Single-base alleles (the common SNV case) map straight to their canonical str
+_BASES = {bytes([c]): chr(c).upper() for c in _BASE_CHARS}
+
+
+@dataclass(frozen=True)
+class VariantRecord:
+    """Unvalidated, slotted variant used internally by the parser and engine.
+
+    Same fields as ``Variant`` (``ref``/``alt`` uppercased by the parser),
+    except that the cold columns — INFO, FORMAT and the samples — stay as
+    one raw byte slice of the source line (``tail``). ``info`` and
+    ``genotype`` are decoded from it on first access. Converted with
+    ``to_model()`` only at the API boundary so the hot path never pays for
+    Pydantic validation.
+
+    Records are frozen (and so hashable); the lazy caches are filled with
+    ``object.__setattr__``.
+    """
+    __slots__ = (
+        "chrom", "pos", "rsid", "ref", "alt",
+        "quality", "filter_status", "tail", "_info", "_genotype",
+    )
+    chrom: str
+    pos: int
+    rsid: Optional[str]
+    ref: str
+    alt: str
+    quality: Optional[float]
+    filter_status: str
+    tail: bytes  # raw columns 8+ of the line: INFO[\tFORMAT\tSAMPLE...]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_info", None)
+        object.__setattr__(self, "_genotype", _MISSING)
+
+    @property
+    def info_raw(self) -> bytes:
+        """The raw INFO column."""
+        return self.tail.partition(b"\t")[0]
+
+    @property
+    def info(self) -> InfoView:
+        """INFO column as a read-only mapping over the raw bytes."""
+        if self._info is None:
+            object.__setattr__(self, "_info", InfoView(self.info_raw))
+        return self._info
+
+    @property
+    def genotype(self) -> Optional[str]:
+        """GT of the first sample, decoded on first access."""
+        if self._genotype is _MISSING:
+            object.__setattr__(self, "_genotype", _genotype_from_tail(self.tail))
+        return self._genotype
+
+    def __reduce__(self):
+        # Frozen slots block the default unpickling path; rebuild through
+        # the parser's fast constructor (lazy caches are recomputed)
+        return (_new_record, (
+            self.chrom, self.pos, self.rsid, self.ref, self.alt,
+            self.quality, self.filter_status, self.tail,
+        ))
+
+    def to_dict(self) -> dict:
+        """Return the JSON-ready dict ``Variant.model_dump()`` would produce."""
+        return {
+            "chrom": self.chrom,
+            "pos": self.pos,
+            "rsid": self.rsid,
+            "ref": self.ref,
+            "alt": self.alt,
+            "quality": self.quality,
+            "filter_status": self.filter_status,
+            "info": self.info.to_dict(),
+            "genotype": self.genotype,
+        }
+
+    def to_model(self) -> Variant:
+        """Return the API-facing ``Variant`` for this record."""
+        return Variant.model_construct(
+            chrom=self.chrom,
+            pos=self.pos,
+            rsid=self.rsid,
+            ref=self.ref,
+            alt=self.alt,
+            quality=self.quality,
+            filter_status=self.filter_status,
+            info=self.info.to_dict(),
+            genotype=self.genotype,
+        )
+
+
+# Parser-side constructor: the frozen dataclass __init__ sends every field
+# through object.__setattr__; writing the slot descriptors directly builds
+# an identical record in roughly half the time.
+_new_object = object.__new__
+_set_chrom = VariantRecord.chrom.__set__
+_set_pos = VariantRecord.pos.__set__
+_set_rsid = VariantRecord.rsid.__set__
+_set_ref = VariantRecord.ref.__set__
+_set_alt = VariantRecord.alt.__set__
+_set_quality = VariantRecord.quality.__set__
+_set_filter_status = VariantRecord.filter_status.__set__
+_set_tail = VariantRecord.tail.__set__
+_set_info = VariantRecord._info.__set__
+_set_genotype = VariantRecord._genotype.__set__
+
+
+def _new_record(
+    chrom, pos, rsid, ref, alt, quality, filter_status, tail, info=None
+) -> VariantRecord:
+    """Equivalent to ``VariantRecord(...)`` for the parser's hot loop.
+
+    ``info`` pre-fills the INFO cache, so records split from one line can
+    share a single ``InfoView``.
+    """
+    record = _new_object(VariantRecord)
+    _set_chrom(record, chrom)
+    _set_pos(record, pos)
+    _set_rsid(record, rsid)
+    _set_ref(record, ref)
+    _set_alt(record, alt)
+    _set_quality(record, quality)
+    _set_filter_status(record, filter_status)
+    _set_tail(record, tail)
+    _set_info(record, info)
+    _set_genotype(record, _MISSING)
+    return record
+
+
+def parse_vcf(
+    file_content: str | bytes | BinaryIO | os.PathLike,
+    layout: str = "records",
+    parse_samples: bool = True,
+) -> dict:
     """Parse a VCF v4.2 file and return structured variant data.
 
     Args:
-        file_content: VCF file content as string, bytes, or file-like object.
+        file_content: VCF file content as string or bytes, a file-like
+            object, or a path (``os.PathLike``; a plain ``str`` is always
+            treated as content). Paths and file objects backed by a real
+            file descriptor are memory-mapped rather than read into memory. Parsing runs on raw bytes
+            throughout (text input is encoded once up front); only fields
+            that become ``str`` attributes are ever decoded.
+        layout: Shape of ``result["variants"]``:
+            ``"records"`` — list of ``VariantRecord`` (default);
+            ``"columns"`` — dict of per-field lists (see ``_COLUMNS``);
+            ``"arrow"`` — ``pyarrow.Table`` with the same columns, CHROM and
+            FILTER dictionary-encoded. Requires the optional ``pyarrow``.
+        parse_samples: When False, the FORMAT and sample columns are
+            dropped as each line is read, so records only keep their INFO
+            bytes and ``genotype`` is None. Use it when only variant-level
+            fields are needed; on many-sample files it frees most of the
+            memory the records would otherwise pin.
 
     Returns:
-        dict with keys: variants, sample_ids, total_variants, meta_info.
+        dict with keys: variants, sample_ids (tuple, file order),
+        sample_index (sample ID -> position in sample_ids), total_variants,
+        meta_info.
     """
-    # Normalize input to list of lines
-    if isinstance(file_content, bytes):
-        lines = file_content.decode("utf-8", errors="replace").splitlines()
-    elif hasattr(file_content, "read"):
-        raw = file_content.read()
-        if isinstance(raw, bytes):
-            raw = raw.decode("utf-8", errors="replace")
-        lines = raw.splitlines()
+    if layout not in ("records", "columns", "arrow"):
+        raise ValueError(f"Unknown layout {layout!r}; expected 'records', 'columns' or 'arrow'.")
+
+    header: dict = {"meta_info": {}, "sample_ids": ()}
+    with _open_buffer(file_content) as buf:
+        records = _iter_records(buf, header, parse_samples)
+        if layout == "records":
+            # list() grows the result in C; pre-sizing from a newline count
+            # needs a Python-level store loop and measured slower
+            variants = list(records)
+            total = len(variants)
+        else:
+            columns = _collect_columns(records)
+            total = len(columns["pos"])
+            variants = columns if layout == "columns" else _to_arrow(columns)
+
+    return {
+        "variants": variants,
+        "sample_ids": header["sample_ids"],
+        "sample_index": {sample: i for i, sample in enumerate(header["sample_ids"])},
+        "total_variants": total,
+        "meta_info": header["meta_info"],
+    }
+
+
+def parse_vcf_header(file_content: str | bytes | BinaryIO | os.PathLike) -> dict:
+    """Parse only the header of a VCF file.
+
+    Reading stops at the ``#CHROM`` line, so the cost depends on the header
+    size alone: bytes, paths and real files are sliced in place (the body
+    of a file is never paged in), while text and streams without a file
+    descriptor are consumed line by line only up to ``#CHROM``. Accepts
+    the same inputs as ``parse_vcf``.
+
+    Returns:
+        dict with keys: sample_ids, sample_index, meta_info (as in
+        ``parse_vcf``).
+    """
+    header: dict = {"meta_info": {}, "sample_ids": ()}
+    if isinstance(file_content, str):
+        _read_header(_take_header_lines(_text_readline(file_content)), header)
+    elif hasattr(file_content, "read") and not isinstance(file_content, os.PathLike):
+        mm = _mmap_file(file_content)
+        if mm is None:
+            _read_header(_take_header_lines(file_content.readline), header)
+        else:
+            with mm:
+                _read_header(mm[:_header_end(mm)], header)
     else:
-        lines = file_content.splitlines()
+        with _open_buffer(file_content) as buf:
+            _read_header(buf[:_header_end(buf)], header)
+    return {
+        "sample_ids": header["sample_ids"],
+        "sample_index": {sample: i for i, sample in enumerate(header["sample_ids"])},
+        "meta_info": header["meta_info"],
+    }
+
+
+def iter_variants(
+    file_content: str | bytes | BinaryIO | os.PathLike, parse_samples: bool = True
+) -> Iterator[VariantRecord]:
+    """Yield the records of a VCF file one at a time.
+
+    Accepts the same inputs as ``parse_vcf`` but never holds more than the
+    current line's records, so memory stays flat regardless of file size.
+    Header lines are consumed but not returned.
+    """
+    with _open_buffer(file_content) as buf:
+        yield from _iter_records(buf, {"meta_info": {}, "sample_ids": ()}, parse_samples)
+
 
-    meta_info: dict = {}
+@contextmanager
+def _open_buffer(file_content: str | bytes | BinaryIO | os.PathLike) -> Iterator[_Buffer]:
+    """Normalize parser input to a bytes-like buffer (mmap for real files)."""
+    if isinstance(file_content, os.PathLike):
+        with open(file_content, "rb") as f:
+            mm = _mmap_file(f)
+            if mm is None:
+                yield f.read()
+                return
+            with mm:
+                yield mm
+        return
+
+    if hasattr(file_content, "read"):
+        mm = _mmap_file(file_content)
+        if mm is not None:
+            with mm:
+                yield mm
+            return
+        file_content = file_content.read()
+
+    if isinstance(file_content, str):
+        file_content = file_content.encode("utf-8", errors="replace")
+    yield file_content
+
+
+def _mmap_file(f: BinaryIO) -> Optional[mmap.mmap]:
+    """Memory-map a file object opened on a real file, or return None."""
+    try:
+        if f.tell() != 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # No usable descriptor (BytesIO, sockets, ...) or an empty file
+        return None
+
+
+def _iter_records(buf: _Buffer, header: dict, parse_samples: bool = True) -> Iterator[VariantRecord]:
+    """Scan a raw VCF buffer line by line, yielding its records.
+
+    Header lines are recorded into ``header["meta_info"]`` and
+    ``header["sample_ids"]`` as they are met. With ``parse_samples`` off,
+    each record's tail is cut down to the INFO column.
+    """
+    meta_info: dict = header["meta_info"]
     header_cols: list[str] = []
-    sample_ids: list[str] = []
-    variants: list[Variant] = []
+    chrom_pool: dict[bytes, str] = {}
+    filter_pool: dict[bytes, str] = {}
+    # QUAL usually repeats a few values (caller-capped or integer scores)
+    qual_pool: dict[bytes, float] = {}
+
+    bases = _BASES.get
+    intern = sys.intern
+    new_record = _new_record
+    # CRLF needs no special case: the rstrip() below drops the \r as well
+    for block in _iter_blocks(buf):
+        for line in block.split(b"\n"):
+            if not line:
+                continue
+
+            if line[0] == 0x23:  # '#'
+                line = line.rstrip()
+                # ── Meta-information lines (##)
+                if line[:2] == b"##":
+                    _parse_meta_line(line.decode("utf-8", errors="replace"), meta_info)
+                # ── Header line (#CHROM ...)
+                elif line[:6] in (b"#CHROM", b"#chrom"):
+                    header_cols = line.decode("utf-8", errors="replace").lstrip("#").split("\t")
+                    # Sample IDs are columns after FORMAT (index 8)
+                    header["sample_ids"] = tuple(header_cols[9:])
+                continue
+
+            # ── Data lines — INFO onwards stays as one unsplit slice.
+            # rstrip() returns the same object unless there is trailing whitespace.
+            fields = line.rstrip().split(b"\t", 7)
+            if len(fields) < 8:
+                continue  # Malformed line
+
+            # The per-line decode is kept inline (rather than a call per line)
+            # since interpreter dispatch dominates this loop
+            chrom_b, pos_b, rsid_b, ref_b, alt_b, qual_b, filter_b, tail = fields
+            if not parse_samples:
+                tail = tail.partition(b"\t")[0]  # INFO only
+            try:
+                pos = int(pos_b)
+                quality = qual_pool.get(qual_b)
+                if quality is None and qual_b != b".":
+                    quality = float(qual_b)
+                    if len(qual_pool) < _QUAL_POOL_SIZE:
+                        qual_pool[qual_b] = quality
+            except ValueError:
+                continue
+            # CHROM/FILTER take a handful of values across the whole file
+            chrom = chrom_pool.get(chrom_b)
+            if chrom is None:
+                chrom = chrom_pool[chrom_b] = chrom_b.decode("utf-8", errors="replace")
+            filter_status = filter_pool.get(filter_b)
+            if filter_status is None:
+                filter_status = filter_pool[filter_b] = filter_b.decode("utf-8", errors="replace")
+            # Interned rsIDs hit the identity fast path against the (interned)
+            # DB rsIDs in dict lookups
+            rsid = intern(rsid_b.decode("utf-8", errors="replace")) if rsid_b != b"." else None
+            ref = bases(ref_b) or _decode_allele(ref_b)
+            # INFO / FORMAT / samples are decoded lazily by VariantRecord
+            if b"," not in alt_b:
+                alt = bases(alt_b) or _decode_allele(alt_b)
+                yield new_record(chrom, pos, rsid, ref, alt, quality, filter_status, tail)
+                continue
+            # Multi-allelic: one record per ALT allele. They share the raw
+            # tail and one InfoView, so INFO is parsed at most once per line.
+            info = InfoView(tail.partition(b"\t")[0])
+            for allele_b in alt_b.split(b","):
+                allele_b = allele_b.strip()
+                alt = bases(allele_b) or _decode_allele(allele_b)
+                yield new_record(chrom, pos, rsid, ref, alt, quality, filter_status, tail, info)
+
 
-    for line in lines:
-        line = line.strip()
+def _iter_blocks(buf: _Buffer) -> Iterator[bytes]:
+    """Slice ``buf`` into ~``_BLOCK_SIZE`` chunks that end on a newline.
+
+    Each block is then split with one ``bytes.split`` call, so the newline
+    scan runs in C across many lines instead of one ``find`` + slice per
+    line from Python. The block size keeps streaming memory bounded.
+    """
+    find = buf.find
+    start = 0
+    end = len(buf)
+    while start < end:
+        stop = start + _BLOCK_SIZE
+        if stop < end:
+            nl = find(b"\n", stop)
+            stop = end if nl == -1 else nl + 1
+        else:
+            stop = end
+        yield buf[start:stop]
+        start = stop
+
+
+def _take_header_lines(readline: Callable[[], str | bytes]) -> bytes:
+    """Read lines up to and including ``#CHROM`` (see ``_header_end``)."""
+    lines: list[bytes] = []
+    while True:
+        line = readline()
         if not line:
-            continue
-
-        # ── Meta-information lines (##)
-        if line.startswith("##"):
-            _parse_meta_line(line, meta_info)
-            continue
-
-        # ── Header line (#CHROM ...)
-        if line.startswith("#CHROM") or line.startswith("#chrom"):
-            header_cols = line.lstrip("#").split("\t")
-            # Sample IDs are columns after FORMAT (index 8)
-            if len(header_cols) > 9:
-                sample_ids = header_cols[9:]
-            elif len(header_cols) > 8:
-                sample_ids = header_cols[9:] if len(header_cols) > 9 else []
-            continue
-
-        # ── Data lines
-        fields = line.split("\t")
-        if len(fields) < 8:
-            continue  # Malformed line
-
-        variant = _parse_variant_line(fields, sample_ids)
-        if variant:
-            # Handle multi-allelic: split into separate Variant records
-            alts = variant.alt.split(",")
-            if len(alts) > 1:
-                for alt in alts:
-                    v = variant.model_copy(update={"alt": alt.strip()})
-                    variants.append(v)
-            else:
-                variants.append(variant)
+            break
+        if isinstance(line, str):
+            line = line.encode("utf-8", errors="replace")
+        if line[:1] != b"#" and line.strip():
+            break
+        lines.append(line)
+        if line[:6] in (b"#CHROM", b"#chrom"):
+            break
+    return b"".join(lines)
 
-    return {
-        "variants": variants,
-        "sample_ids": sample_ids,
-        "total_variants": len(variants),
-        "meta_info": meta_info,
-    }
+
+def _text_readline(text: str) -> Callable[[], str]:
+    """``readline`` over a str without copying or splitting all of it."""
+    pos = 0
+
+    def readline() -> str:
+        nonlocal pos
+        nl = text.find("\n", pos)
+        stop = len(text) if nl == -1 else nl + 1
+        line = text[pos:stop]
+        pos = stop
+        return line
+
+    return readline
+
+
+def _read_header(header_bytes: bytes, header: dict) -> None:
+    """Fill ``header`` from a buffer holding header lines only."""
+    for _ in _iter_records(header_bytes, header):
+        pass
+
+
+def _header_end(buf: _Buffer) -> int:
+    """Offset of the first body byte.
+
+    That is just past the ``#CHROM`` line, or the first data line if the
+    header ends without one. Only the header lines themselves are read.
+    """
+    find = buf.find
+    end = len(buf)
+    pos = 0
+    while pos < end:
+        nl = find(b"\n", pos)
+        stop = end if nl == -1 else nl + 1
+        line = buf[pos:stop]
+        if line[:1] != b"#" and line.strip():
+            return pos
+        pos = stop
+        if line[:6] in (b"#CHROM", b"#chrom"):
+            break
+    return pos
+
+
+_COLUMNS = ("chrom", "pos", "rsid", "ref", "alt", "quality", "filter_status", "genotype")
+
+
+def _collect_columns(records: Iterator[VariantRecord]) -> dict[str, list]:
+    """Gather records field-by-field into one list per column."""
+    columns: dict[str, list] = {name: [] for name in _COLUMNS}
+    appenders = [columns[name].append for name in _COLUMNS]
+    chrom, pos, rsid, ref, alt, quality, filter_status, genotype = appenders
+    for v in records:
+        chrom(v.chrom)
+        pos(v.pos)
+        rsid(v.rsid)
+        ref(v.ref)
+        alt(v.alt)
+        quality(v.quality)
+        filter_status(v.filter_status)
+        genotype(v.genotype)
+    return columns
+
+
+def _to_arrow(columns: dict[str, list]):
+    """Build a ``pyarrow.Table`` from ``_collect_columns`` output."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("layout='arrow' requires the optional 'pyarrow' package.") from e
+
+    return pa.table({
+        "chrom": pa.array(columns["chrom"], pa.string()).dictionary_encode(),
+        "pos": pa.array(columns["pos"], pa.int64()),
+        "rsid": pa.array(columns["rsid"], pa.string()),
+        "ref": pa.array(columns["ref"], pa.string()),
+        "alt": pa.array(columns["alt"], pa.string()),
+        "quality": pa.array(columns["quality"], pa.float64()),
+        "filter_status": pa.array(columns["filter_status"], pa.string()).dictionary_encode(),
+        "genotype": pa.array(columns["genotype"], pa.string()),
+    })
+
+
+# Meta keys are word characters only (##fileformat, ##INFO, ...)
+_META_KEY_RE = re.compile(r"\w+")
 
 
 def _parse_meta_line(line: str, meta_info: dict) -> None:
     """Parse a ## meta-information line into the meta_info dict."""
     # e.g., ##fileformat=VCFv4.2
-    match = re.match(r"^##(\w+)=(.+)$", line)
-    if match:
-        key, value = match.group(1), match.group(2)
-        if key in meta_info:
-            if not isinstance(meta_info[key], list):
-                meta_info[key] = [meta_info[key]]
-            meta_info[key].append(value)
-        else:
-            meta_info[key] = value
+    key, sep, value = line[2:].partition("=")
+    if not (sep and value and _META_KEY_RE.fullmatch(key)):
+        return
+    if key in meta_info:
+        if not isinstance(meta_info[key], list):
+            meta_info[key] = [meta_info[key]]
+        meta_info[key].append(value)
+    else:
+        meta_info[key] = value
 
 
-def _parse_variant_line(
-    fields: list[str], sample_ids: list[str]
-) -> Variant | None:
-    """Parse a single data line into a Variant object."""
-    try:
-        chrom = fields[0]
-        pos = int(fields[1])
-        rsid = fields[2] if fields[2] != "." else None
-        ref = fields[3]
-        alt = fields[4]
-        quality = float(fields[5]) if fields[5] != "." else None
-        filter_status = fields[6]
-
-        # Parse INFO field
-        info = _parse_info(fields[7])
-
-        # Parse genotype from first sample if available
-        genotype = None
-        if len(fields) > 9:
-            format_field = fields[8]
-            sample_field = fields[9]
-            genotype = _extract_genotype(format_field, sample_field)
-
-        return Variant(
-            chrom=chrom,
-            pos=pos,
-            rsid=rsid,
-            ref=ref,
-            alt=alt,
-            quality=quality,
-            filter_status=filter_status,
-            info=info,
-            genotype=genotype,
-        )
-    except (ValueError, IndexError):
-        return None
+def _decode_allele(allele: bytes) -> str:
+    """Decode a REF/ALT allele, uppercasing it only if it is made of bases.
+
+    Symbolic (``<INS:ME:Alu>``) and breakend (``G]chr17:198982]``) alleles
+    carry case-sensitive IDs and contig names, so they are kept verbatim.
+    """
+    if not allele.translate(None, _BASE_CHARS):
+        return allele.upper().decode("ascii")
+    return allele.decode("utf-8", errors="replace")
 
 
-def _parse_info(info_str: str) -> dict:
+def _parse_info(info_raw: bytes) -> dict:
     """Parse the INFO field (key=value;key=value)."""
+    info_str = info_raw.decode("utf-8", errors="replace")
     if info_str == ".":
         return {}
     info = {}
+    intern = sys.intern
     for item in info_str.split(";"):
-        if "=" in item:
-            k, v = item.split("=", 1)
-            info[k] = v
-        else:
-            info[item] = True
+        # partition returns a fixed 3-tuple: no per-token list, no second scan
+        k, sep, v = item.partition("=")
+        # The same few keys repeat on every line; interning keeps one str
+        # per key across all parsed dicts
+        info[intern(k)] = v if sep else True
     return info
 
 
-def _extract_genotype(format_field: str, sample_field: str) -> str | None:
+def _genotype_from_tail(tail: bytes) -> str | None:
+    """Extract the first sample's GT from the raw INFO\tFORMAT\tSAMPLE... columns."""
+    columns = tail.split(b"\t", 2)
+    if len(columns) < 3:
+        return None
+    return _extract_genotype(columns[1], columns[2].partition(b"\t")[0])
+
+
+def _extract_genotype(format_field: bytes, sample_field: bytes) -> str | None:
     """Extract the GT (genotype) value from FORMAT and sample columns."""
-    fmt_keys = format_field.split(":")
-    sample_vals = sample_field.split(":")
+    # VCF requires GT to be the first FORMAT key when present
+    if format_field == b"GT" or format_field.startswith(b"GT:"):
+        return _decode_gt(sample_field.partition(b":")[0])
+
+    fmt_keys = format_field.split(b":")
+    sample_vals = sample_field.split(b":")
     try:
-        gt_idx = fmt_keys.index("GT")
-        return sample_vals[gt_idx]
+        gt_idx = fmt_keys.index(b"GT")
+        return _decode_gt(sample_vals[gt_idx])
     except (ValueError, IndexError):
         return None
+
+
+# GT values ("0/1", "1|1", ...) come from a tiny set; share one str for each
+@lru_cache(maxsize=256)
+def _decode_gt(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace")
@@ -12,16 +12,24 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.models import AnalyzeRequest, AnalyzeResponse, ParseVCFResponse
 from app.vcf_parser import parse_vcf
-from app.pharma_engine import analyze_variants, convert_to_required_schema, get_supported_drugs
+from app.pharma_engine import (
+    analyze_variants,
+    build_variant_map,
+    convert_to_required_schema,
+    get_supported_drugs,
+)
 
 app = FastAPI(
     title="PharmaGuard API",
     description="Pharmacogenomic Risk Prediction System — Backend",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # ── CORS ───────────────────────────────────────────────────────────────
@@ -59,16 +67,28 @@ async def parse_vcf_endpoint(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
     try:
-        result = parse_vcf(content)
+        # Parsing and serializing are CPU-bound — keep both off the event loop
+        payload = await run_in_threadpool(_parse_vcf_payload, content)
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Failed to parse VCF file: {str(e)}")
 
-    return ParseVCFResponse(
-        variants=result["variants"],
-        sample_ids=result["sample_ids"],
-        total_variants=result["total_variants"],
-        meta_info=result["meta_info"],
-    )
+    return ORJSONResponse(content=payload)
+
+
+def _parse_vcf_payload(content: bytes) -> dict:
+    """Parse a VCF upload and build the /parse-vcf response body.
+
+    Records are already well-typed, so they are serialized directly rather
+    than round-tripped through ParseVCFResponse validation. INFO and GT are
+    lazy, so ``to_dict()`` is where they are actually decoded.
+    """
+    result = parse_vcf(content)
+    return {
+        "variants": [v.to_dict() for v in result["variants"]],
+        "sample_ids": result["sample_ids"],
+        "total_variants": result["total_variants"],
+        "meta_info": result["meta_info"],
+    }
 
 
 @app.post("/analyze", response_model=AnalyzeResponse)
@@ -80,20 +100,28 @@ async def analyze_endpoint(request: AnalyzeRequest):
     if not request.drug_names:
         raise HTTPException(status_code=400, detail="At least one drug name is required.")
 
+    # One timestamp for every result and the response metadata
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    # Index variants by rsID once for both engine phases
+    variant_map = build_variant_map(request.variants)
+
     # Run the internal analysis
-    internal_results = analyze_variants(request.variants, request.drug_names)
+    internal_results = analyze_variants(request.variants, request.drug_names, variant_map)
 
     # Convert to the required output schema
     schema_results = convert_to_required_schema(
         results=internal_results,
         variants=request.variants,
         sample_id="PATIENT_001",
+        variant_map=variant_map,
+        timestamp=timestamp,
     )
 
     return AnalyzeResponse(
         results=schema_results,
         metadata={
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": timestamp,
             "variant_count": len(request.variants),
             "drug_count": len(request.drug_names),
         },
@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 
 from app.models import Variant, RiskLevel
-from app.pharma_engine import analyze_variants, get_supported_drugs
+from app.pharma_engine import analyze_variants, convert_to_required_schema, get_supported_drugs
 from app.vcf_parser import parse_vcf
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -107,6 +107,16 @@ class TestAnalyzeVariants:
         for r in results:
             assert r.drug_risk.risk_level == RiskLevel.NORMAL
 
+    def test_lowercase_alleles_from_api(self):
+        """Lowercase alleles in API input are matched against the risk allele."""
+        variant = Variant(
+            chrom="chr10", pos=96541616, rsid="rs4244285",
+            ref="g", alt="a", genotype="1/1",
+        )
+        assert (variant.ref, variant.alt) == ("G", "A")
+        results = analyze_variants([variant], ["clopidogrel"])
+        assert results[0].drug_risk.risk_level == RiskLevel.CRITICAL
+
     def test_result_has_evidence(self):
         """Results should include evidence sources."""
         variants = _load_sample_variants()
@@ -121,3 +131,16 @@ class TestAnalyzeVariants:
         assert len(results) == 1
         r = results[0].drug_risk
         assert r.risk_level == RiskLevel.HIGH
+
+
+class TestConvertToRequiredSchema:
+    def test_pgx_variants_counted_once_per_rsid(self):
+        """Repeated records for one rsID count as a single pharmacogenomic variant."""
+        variants = _load_sample_variants()
+        duplicated = variants + [v for v in variants if v.rsid == "rs1799853"]
+        results = convert_to_required_schema(
+            analyze_variants(duplicated, ["warfarin"]), duplicated
+        )
+        metrics = results[0].quality_metrics
+        assert metrics.total_variants_parsed == len(duplicated)
+        assert metrics.pharmacogenomic_variants_found == 15
@@ -1,40 +1,77 @@
 """Tests for the VCF v4.2 parser."""
 
+import dataclasses
+import io
 import os
+import pickle
+import tracemalloc
 from pathlib import Path
 
 import pytest
 
-from app.vcf_parser import parse_vcf
+from app.models import Variant
+from app.vcf_parser import VariantRecord, _new_record, iter_variants, parse_vcf, parse_vcf_header
 
 FIXTURES = Path(__file__).parent / "fixtures"
 SAMPLE_VCF = FIXTURES / "sample.vcf"
 
 
+_GENERATED_HEADER = (
+    "##fileformat=VCFv4.2\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tSAMPLE1\n"
+)
+_GENERATED_RECORD = "chr1\t{0}\trs{1}\tA\tG\t50\tPASS\tDP=30\tGT:DP\t0/1:30"
+
+
+def _generated_vcf(n_records: int) -> str:
+    """Build a single-sample VCF with ``n_records`` SNV records."""
+    body = "\n".join(map(
+        _GENERATED_RECORD.format, range(1000, 1000 + n_records), range(900000, 900000 + n_records)
+    ))
+    return _GENERATED_HEADER + body + "\n"
+
+
+@pytest.fixture(scope="session")
+def sample_parsed() -> dict:
+    """The sample VCF, parsed once and shared (read-only) across tests."""
+    return parse_vcf(SAMPLE_VCF.read_bytes())
+
+
 class TestParseVCF:
     """Test suite for VCF parsing."""
 
-    def test_parse_sample_file(self):
+    def test_parse_sample_file(self, sample_parsed):
         """Parse the sample VCF and verify basic structure."""
-        with open(SAMPLE_VCF, "r") as f:
-            result = parse_vcf(f.read())
+        result = sample_parsed
 
         assert result["total_variants"] > 0
         assert len(result["variants"]) == result["total_variants"]
         assert "PATIENT_001" in result["sample_ids"]
+        index = result["sample_index"]
+        assert result["sample_ids"][index["PATIENT_001"]] == "PATIENT_001"
 
-    def test_meta_info_extraction(self):
+    def test_meta_info_extraction(self, sample_parsed):
         """Verify meta-information lines are parsed."""
-        with open(SAMPLE_VCF, "r") as f:
-            result = parse_vcf(f.read())
+        result = sample_parsed
 
         assert "fileformat" in result["meta_info"]
         assert result["meta_info"]["fileformat"] == "VCFv4.2"
 
-    def test_variant_fields(self):
+    def test_malformed_meta_lines_ignored(self):
+        """Only ##key=value lines with a word-character key are recorded."""
+        vcf_text = (
+            "##fileformat=VCFv4.2\n"
+            "## comment = x\n"
+            "##=novalue\n"
+            "##empty=\n"
+            "##1000G=yes\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        )
+        assert parse_vcf(vcf_text)["meta_info"] == {"fileformat": "VCFv4.2", "1000G": "yes"}
+
+    def test_variant_fields(self, sample_parsed):
         """Verify individual variant fields are populated correctly."""
-        with open(SAMPLE_VCF, "r") as f:
-            result = parse_vcf(f.read())
+        result = sample_parsed
 
         # Find the CYP2C9 rs1799853 variant
         v = next((v for v in result["variants"] if v.rsid == "rs1799853"), None)
@@ -47,20 +84,46 @@ class TestParseVCF:
         assert v.filter_status == "PASS"
         assert v.genotype == "0/1"
 
-    def test_info_field_parsing(self):
+    def test_info_field_parsing(self, sample_parsed):
         """Verify INFO field key=value pairs are parsed."""
-        with open(SAMPLE_VCF, "r") as f:
-            result = parse_vcf(f.read())
+        result = sample_parsed
 
         v = next((v for v in result["variants"] if v.rsid == "rs1799853"), None)
         assert v is not None
         assert v.info.get("DP") == "120"
         assert v.info.get("GENE") == "CYP2C9"
 
-    def test_multi_allelic_splitting(self):
+    def test_info_parsed_lazily(self):
+        """INFO is kept raw until first read, then cached."""
+        result = parse_vcf(SAMPLE_VCF.read_bytes())
+        v = next(v for v in result["variants"] if v.rsid == "rs1799853")
+        assert v.info_raw == b"DP=120;AF=0.5;GENE=CYP2C9"
+        assert v._info is None
+        assert v.info is v.info
+
+    def test_info_key_lookup_without_full_parse(self):
+        """info.get scans for one key; the full dict is only built on demand."""
+        vcf_text = (
+            "##fileformat=VCFv4.2\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+            "chr1\t100\trs1\tA\tG\t50\tPASS\tDP=30;SOMATIC;GENE=ABC\n"
+        )
+        info = parse_vcf(vcf_text)["variants"][0].info
+        assert info.get("GENE") == "ABC"
+        assert info["SOMATIC"] is True
+        assert info.get("AF") is None
+        # Non-str keys behave as in a plain dict: simply absent
+        assert info.get(1) is None and None not in info
+        with pytest.raises(KeyError):
+            info[None]
+        assert "DP" in info
+        assert not info._complete
+        assert info == {"DP": "30", "SOMATIC": True, "GENE": "ABC"}
+        assert list(info) == ["DP", "SOMATIC", "GENE"]
+
+    def test_multi_allelic_splitting(self, sample_parsed):
         """Verify multi-allelic variants are split into separate records."""
-        with open(SAMPLE_VCF, "r") as f:
-            result = parse_vcf(f.read())
+        result = sample_parsed
 
         # rs100005 has ALT=G,T — should be split into two variants
         multi = [v for v in result["variants"] if v.rsid == "rs100005"]
@@ -68,6 +131,51 @@ class TestParseVCF:
         alts = {v.alt for v in multi}
         assert "G" in alts
         assert "T" in alts
+        # Split records share one INFO view rather than parsing it per allele
+        assert multi[0].info is multi[1].info
+
+    def test_record_converts_to_api_model(self, sample_parsed):
+        """Parsed records convert to the Pydantic Variant at the API boundary."""
+        result = sample_parsed
+
+        record = next(v for v in result["variants"] if v.rsid == "rs1799853")
+        model = record.to_model()
+        assert isinstance(model, Variant)
+        assert model == Variant(**model.model_dump())
+        assert model.info == record.info
+        assert record.to_dict() == model.model_dump()
+
+    def test_records_are_frozen_and_hashable(self, sample_parsed):
+        """Records are immutable and usable as set members / dict keys."""
+        v = sample_parsed["variants"][0]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            v.alt = "G"
+        assert len(set(sample_parsed["variants"])) == len(sample_parsed["variants"])
+        # The parser's fast constructor builds the same record as __init__
+        rebuilt = dataclasses.replace(v)
+        assert rebuilt == v and hash(rebuilt) == hash(v)
+        assert rebuilt.to_dict() == v.to_dict()
+        # Frozen slots still pickle (rebuilt through the fast constructor)
+        unpickled = pickle.loads(pickle.dumps(v))
+        assert unpickled == v and unpickled.to_dict() == v.to_dict()
+
+    def test_skip_sample_columns(self, sample_parsed):
+        """parse_samples=False drops FORMAT/SAMPLE but keeps every other field."""
+        result = parse_vcf(SAMPLE_VCF.read_bytes(), parse_samples=False)
+        assert result["sample_ids"] == sample_parsed["sample_ids"]
+        assert len(result["variants"]) == len(sample_parsed["variants"])
+        for v, full in zip(result["variants"], sample_parsed["variants"]):
+            assert v.genotype is None
+            assert b"\t" not in v.tail
+            assert (v.rsid, v.pos, v.alt, v.info) == (full.rsid, full.pos, full.alt, full.info)
+
+    def test_fast_constructor_matches_init(self):
+        """_new_record fills every field exactly like VariantRecord(...)."""
+        args = ("chr7", 117559590, "rs113993960", "CTT", "C", 42.5, "q10", b"DP=7\tGT\t1/1")
+        fast, slow = _new_record(*args), VariantRecord(*args)
+        for field in dataclasses.fields(VariantRecord):
+            assert getattr(fast, field.name) == getattr(slow, field.name), field.name
+        assert fast._info is None and fast.genotype == slow.genotype == "1/1"
 
     def test_bytes_input(self):
         """Verify parser accepts bytes input."""
@@ -76,6 +184,31 @@ class TestParseVCF:
         result = parse_vcf(content)
         assert result["total_variants"] > 0
 
+    def test_str_and_bytes_inputs_match(self):
+        """Text input is encoded once and parsed identically to raw bytes."""
+        raw = SAMPLE_VCF.read_bytes()
+        assert parse_vcf(raw.decode("utf-8")) == parse_vcf(raw)
+
+    def test_file_object_input(self):
+        """Verify parser accepts an open file (memory-mapped) with identical results."""
+        with open(SAMPLE_VCF, "rb") as f:
+            from_file = parse_vcf(f)
+        from_bytes = parse_vcf(SAMPLE_VCF.read_bytes())
+        assert from_file == from_bytes
+
+    def test_path_input(self, sample_parsed, tmp_path):
+        """A Path is opened and memory-mapped; a plain str stays VCF text."""
+        assert parse_vcf(SAMPLE_VCF) == sample_parsed
+
+        generated = tmp_path / "generated.vcf"
+        generated.write_text(_generated_vcf(2500))
+        assert parse_vcf(generated)["total_variants"] == 2500
+
+        empty = tmp_path / "empty.vcf"
+        empty.touch()
+        assert parse_vcf(empty)["variants"] == []
+        assert parse_vcf(str(generated))["variants"] == []
+
     def test_missing_rsid(self):
         """Variants with '.' as ID should have rsid=None."""
         vcf_text = (
@@ -87,6 +220,32 @@ class TestParseVCF:
         assert len(result["variants"]) == 1
         assert result["variants"][0].rsid is None
 
+    def test_alleles_uppercased(self):
+        """REF/ALT are canonicalized to uppercase."""
+        vcf_text = (
+            "##fileformat=VCFv4.2\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+            "chr1\t100\trs1\tc\tt,g\t50\tPASS\tDP=30\n"
+        )
+        result = parse_vcf(vcf_text)
+        assert [(v.ref, v.alt) for v in result["variants"]] == [("C", "T"), ("C", "G")]
+
+    def test_symbolic_and_breakend_alleles_keep_case(self):
+        """Only base alleles are uppercased; symbolic/breakend ALTs are verbatim."""
+        vcf_text = (
+            "##fileformat=VCFv4.2\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+            "chr2\t321681\tbnd_W\tg\tG]chr17:198982]\t6\tPASS\tSVTYPE=BND\n"
+            "chr3\t100\trs2\tt\t<INS:ME:Alu>,acg\t50\tPASS\tSVTYPE=INS\n"
+        )
+        variants = parse_vcf(vcf_text)["variants"]
+        assert [(v.ref, v.alt) for v in variants] == [
+            ("G", "G]chr17:198982]"), ("T", "<INS:ME:Alu>"), ("T", "ACG"),
+        ]
+        assert [v.to_model().alt for v in variants] == [v.alt for v in variants]
+        assert Variant(**variants[1].to_dict()).alt == "<INS:ME:Alu>"
+        assert Variant(**{**variants[2].to_dict(), "alt": "acg"}).alt == "ACG"
+
     def test_empty_file(self):
         """Empty file should return zero variants."""
         result = parse_vcf("")
@@ -95,15 +254,77 @@ class TestParseVCF:
 
     def test_large_file_generation(self):
         """Generate and parse a VCF with 2000+ records."""
-        header = (
-            "##fileformat=VCFv4.2\n"
-            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tSAMPLE1\n"
-        )
-        lines = [header]
-        for i in range(2500):
-            lines.append(
-                f"chr1\t{1000 + i}\trs{900000 + i}\tA\tG\t50\tPASS\tDP=30\tGT:DP\t0/1:30\n"
-            )
-        vcf_text = "".join(lines)
+        vcf_text = _generated_vcf(2500)
         result = parse_vcf(vcf_text)
         assert result["total_variants"] == 2500
+
+    def test_iter_variants_streams(self):
+        """iter_variants yields every record without materializing them all."""
+        vcf_bytes = _generated_vcf(2500).encode()
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_variants(vcf_bytes))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 2500
+        assert peak < 64 * 1024
+
+    def test_repeated_strings_are_shared(self):
+        """Repeated CHROM/FILTER/REF/ALT/GT/QUAL values reuse one object each."""
+        variants = parse_vcf(_generated_vcf(100))["variants"]
+        for attr in ("chrom", "filter_status", "ref", "alt", "genotype", "quality"):
+            assert len({id(getattr(v, attr)) for v in variants}) == 1, attr
+        info_keys = {id(key) for v in variants for key in v.info.to_dict()}
+        assert len(info_keys) == 1
+
+    def test_columns_layout(self, sample_parsed):
+        """layout='columns' returns one list per field, aligned with the records."""
+        result = parse_vcf(SAMPLE_VCF.read_bytes(), layout="columns")
+        columns = result["variants"]
+        records = sample_parsed["variants"]
+        assert result["total_variants"] == len(records)
+        assert result["sample_ids"] == sample_parsed["sample_ids"]
+        for name in ("chrom", "pos", "rsid", "ref", "alt", "quality", "filter_status", "genotype"):
+            assert columns[name] == [getattr(v, name) for v in records], name
+
+    def test_arrow_layout(self):
+        """layout='arrow' returns a pyarrow.Table with the same columns."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.compute as pc
+
+        result = parse_vcf(SAMPLE_VCF.read_bytes(), layout="arrow")
+        table = result["variants"]
+        assert isinstance(table, pa.Table)
+        assert table.num_rows == result["total_variants"]
+        row = table.filter(pc.equal(table["rsid"], "rs1799853")).to_pylist()
+        assert row == [{
+            "chrom": "chr10", "pos": 96702047, "rsid": "rs1799853", "ref": "C", "alt": "T",
+            "quality": 99.0, "filter_status": "PASS", "genotype": "0/1",
+        }]
+
+    def test_header_only_parse(self, sample_parsed):
+        """parse_vcf_header returns the header fields without reading the body."""
+        header = parse_vcf_header(SAMPLE_VCF)
+        assert header == {
+            key: sample_parsed[key] for key in ("sample_ids", "sample_index", "meta_info")
+        }
+
+        # Everything after #CHROM is left untouched, even bytes that are not VCF
+        vcf_bytes = _generated_vcf(0).encode()
+        assert parse_vcf_header(vcf_bytes + b"\xff" * 1_000_000) == parse_vcf_header(vcf_bytes)
+        assert parse_vcf_header(vcf_bytes)["sample_ids"] == ("SAMPLE1",)
+
+        # Text and unmapped streams stop reading at #CHROM too
+        header_bytes = _GENERATED_HEADER.encode()
+        stream = io.BytesIO(header_bytes + b"chr1\t1\n" * 1000)
+        assert parse_vcf_header(stream) == parse_vcf_header(vcf_bytes)
+        assert stream.tell() == len(header_bytes)
+        assert parse_vcf_header(_generated_vcf(2500)) == parse_vcf_header(vcf_bytes)
+
+    def test_unknown_layout(self):
+        """An unsupported layout name is rejected."""
+        with pytest.raises(ValueError):
+            parse_vcf("", layout="rows")